@@ -1,12 +1,66 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from routes import planner
+import time
+
+# Taken before the heavy imports below so cold start includes module import time
+PROCESS_STARTED = time.perf_counter()
+
+import logging
 import os
+import uuid
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 
 load_dotenv()
 
-app = FastAPI(title="Smart Task Planner API")
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from routes import debug, planner
+from services.llm_client import LLMClient
+from services.planner_logic import PlannerLogic
+from services.plan_store import create_plan_store
+from services.diagnostics import (
+    RequestRecorder, RequestTrace, current_trace, request_id_var, setup_logging, shutdown_logging,
+)
+
+logger = logging.getLogger(__name__)
+
+IMPORT_SECONDS = round(time.perf_counter() - PROCESS_STARTED, 4)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    setup_logging()
+
+    # The LLM client is created on first use so a missing API key does not stop startup
+    app.state.llm = None
+    app.state.logic = PlannerLogic()
+    app.state.plans = create_plan_store()
+    app.state.recorder = RequestRecorder(
+        int(os.getenv("DEBUG_BUFFER_SIZE", "50")), int(os.getenv("DEBUG_WINDOW_SIZE", "1000")),
+    )
+
+    if os.getenv("WARMUP", "0") == "1":
+        app.state.plans.warm_up()
+        if os.getenv("GEMINI_API_KEY"):
+            app.state.llm = LLMClient()
+            app.state.llm.warm_up()
+
+    finished = time.perf_counter()
+    app.state.import_seconds = IMPORT_SECONDS
+    app.state.startup_seconds = round(finished - started, 4)
+    app.state.cold_start_seconds = round(finished - PROCESS_STARTED, 4)
+    logger.info(
+        "Cold start completed in %ss (imports %ss, startup %ss, pid %s)",
+        app.state.cold_start_seconds, app.state.import_seconds, app.state.startup_seconds, os.getpid(),
+    )
+
+    yield
+
+    if app.state.llm is not None:
+        app.state.llm.close()
+    app.state.plans.close()
+    shutdown_logging()
+
+app = FastAPI(title="Smart Task Planner API", lifespan=lifespan)
 
 # Allow frontend at http://localhost:3001
 origins = [
@@ -22,8 +76,52 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex[:12]
+    trace = RequestTrace(request_id, request.method, request.url.path)
+    request_id_var.set(request_id)
+    current_trace.set(trace)
+
+    started = time.perf_counter()
+
+    def finish():
+        trace.duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        request.app.state.recorder.add(trace)
+
+    try:
+        response = await call_next(request)
+    except Exception:
+        finish()
+        raise
+    trace.status_code = response.status_code
+
+    # Stop the clock once the body has been sent, so streamed exports are timed in full
+    body_iterator = response.body_iterator
+
+    async def timed_body():
+        try:
+            async for chunk in body_iterator:
+                yield chunk
+        finally:
+            finish()
+
+    response.body_iterator = timed_body()
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 app.include_router(planner.router, prefix="/api")
 
+# Debug traces hold raw Gemini output with other users' goals, so they are opt-in
+if os.getenv("DEBUG_ENDPOINTS", "0") == "1":
+    app.include_router(debug.router, prefix="/api/debug")
+
 @app.get("/")
 def root():
-    return {"status": "ok", "service": "smart-task-planner backend"}
\ No newline at end of file
+    return {
+        "status": "ok",
+        "service": "smart-task-planner backend",
+        "import_seconds": getattr(app.state, "import_seconds", None),
+        "startup_seconds": getattr(app.state, "startup_seconds", None),
+        "cold_start_seconds": getattr(app.state, "cold_start_seconds", None),
+    }
@@ -25,4 +25,28 @@ class GenerateResponse(BaseModel):
     plan_id: str
     variants: Dict[str, VariantPlan]
     summary: Optional[str] = None
-    assumptions: Optional[str] = None
\ No newline at end of file
+    assumptions: Optional[str] = None
+
+class TimelineTask(Task):
+    team_member: Optional[str] = None
+    row: int = 0
+    offset_days: int = 0
+    duration_days: int = 1
+
+class TimelineLayout(BaseModel):
+    min_date: Optional[str] = None
+    max_date: Optional[str] = None
+    total_days: int = 0
+    row_count: int = 0
+    members: Dict[str, Dict[str, int]] = {}
+
+class VariantPage(BaseModel):
+    plan_id: str
+    variant: str
+    critical_path: List[str]
+    reasoning: Optional[str] = None
+    layout: TimelineLayout
+    tasks: List[TimelineTask]
+    total: int
+    offset: int
+    limit: int
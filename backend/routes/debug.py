@@ -0,0 +1,8 @@
+from fastapi import APIRouter, Request
+
+router = APIRouter()
+
+@router.get("/requests")
+def recent_requests(request: Request):
+    """Slowest requests plus failed ones and those that hit the fallback parser"""
+    return request.app.state.recorder.snapshot()
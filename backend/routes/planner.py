@@ -1,30 +1,143 @@
-from fastapi import APIRouter, HTTPException
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from models.schemas import GenerateRequest, GenerateResponse
+from models.schemas import GenerateRequest, GenerateResponse, VariantPage
 from services.llm_client import LLMClient
 from services.planner_logic import PlannerLogic
+from services.exporters import EXPORT_FORMATS
+from services.timeline import annotate_plan, select_tasks
+from services.utils import make_id, plan_etag
+from services.diagnostics import stage
 
 router = APIRouter()
-llm = LLMClient()
-logic = PlannerLogic()
+
+# Service objects live on app.state and are set up by the lifespan handler in main.py
+def get_llm(request: Request) -> LLMClient:
+    state = request.app.state
+    if state.llm is None:
+        state.llm = LLMClient()
+    return state.llm
+
+def get_logic(request: Request) -> PlannerLogic:
+    return request.app.state.logic
+
+def get_plans(request: Request):
+    return request.app.state.plans
 
 @router.post("/generate_plan", response_model=GenerateResponse)
-async def generate_plan(payload: GenerateRequest):
+async def generate_plan(payload: GenerateRequest, request: Request):
     try:
+        llm = get_llm(request)
+        logic = get_logic(request)
+        plans = get_plans(request)
+
         # Generate plan using LLM
         raw = llm.generate_plan(payload.dict())
         
         # Process the response
-        processed = logic.process_llm_response(raw, payload.dict())
+        with stage("process"):
+            processed = logic.process_llm_response(raw, payload.dict())
         
-        # Return the processed plan directly (no database storage)
+        # Keep the processed plan in the plan store so it can be exported later
         resp = {
-            "plan_id": f"plan_{len(raw.get('variants', {}).get('balanced', {}).get('tasks', []))}_{hash(payload.goal) % 10000}",
+            "plan_id": make_id("plan_"),
             "variants": processed["variants"],
             "summary": processed.get("summary", ""),
             "assumptions": processed.get("assumptions", ""),
         }
+        # Lay out the timeline once here instead of on every read
+        with stage("layout"):
+            annotate_plan(resp)
+            resp["etag"] = plan_etag(resp)
+
+        with stage("store"):
+            plans.save(resp["plan_id"], resp)
         return resp
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"LLM error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"LLM error: {str(e)}")
+
+@router.get("/plans/{plan_id}/export/{fmt}")
+def export_plan(plan_id: str, fmt: str, variant: Optional[str] = None, plans=Depends(get_plans)):
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {fmt}")
+
+    plan = plans.get(plan_id)
+    if plan is None:
+        raise HTTPException(status_code=404, detail=f"Plan not found: {plan_id}")
+
+    # CSV covers every variant unless one is asked for; calendar and XML need a single one
+    if fmt != "csv" and not variant:
+        variant = "balanced"
+    if variant and variant not in plan["variants"]:
+        raise HTTPException(status_code=404, detail=f"Variant not found: {variant}")
+
+    generator, media_type, extension = EXPORT_FORMATS[fmt]
+    filename = f"{plan_id}-{variant}.{extension}" if variant else f"{plan_id}.{extension}"
+    return StreamingResponse(
+        generator(plan, variant),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+@router.get("/plans/{plan_id}/variants/{variant}", response_model=VariantPage)
+def get_variant(
+    plan_id: str,
+    variant: str,
+    request: Request,
+    response: Response,
+    member: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=500, ge=1, le=5000),
+    plans=Depends(get_plans),
+):
+    # Stored plans never change, so the plan's ETag is valid for every page of it.
+    # Check the variant and ETag before loading the plan so revalidation stays cheap.
+    meta = plans.get_meta(plan_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail=f"Plan not found: {plan_id}")
+    if variant not in meta["variants"]:
+        raise HTTPException(status_code=404, detail=f"Variant not found: {variant}")
+    etag = meta["etag"]
+    if etag and _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+    plan = plans.get(plan_id)
+    if plan is None:
+        raise HTTPException(status_code=404, detail=f"Plan not found: {plan_id}")
+
+    etag = etag or plan.get("etag") or plan_etag(plan)
+    response.headers.update({"ETag": etag, "Cache-Control": "no-cache"})
+
+    variant_plan = plan["variants"][variant]
+    if "layout" not in variant_plan:
+        annotate_plan(plan)
+
+    page = []
+    total = 0
+    for task in select_tasks(variant_plan, member=member, start=start, end=end):
+        if offset <= total < offset + limit:
+            page.append(task)
+        total += 1
+
+    return {
+        "plan_id": plan_id,
+        "variant": variant,
+        "critical_path": variant_plan.get("critical_path", []),
+        "reasoning": variant_plan.get("reasoning", ""),
+        "layout": variant_plan["layout"],
+        "tasks": page,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+    }
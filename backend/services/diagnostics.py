@@ -0,0 +1,146 @@
+import heapq
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s request_id=%(request_id)s %(message)s"
+
+# Keep only the start of the raw Gemini text so one bad response cannot bloat the buffer
+MAX_RAW_TEXT_CHARS = 4000
+
+request_id_var = ContextVar("request_id", default="-")
+current_trace = ContextVar("current_trace", default=None)
+
+_listener = None
+_queue_handler = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the id of the request being handled to every log record"""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+
+def setup_logging():
+    """Send log records through a queue so the request path never blocks on stdout"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return _listener
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+
+    _queue_handler = queue_handler
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    global _listener, _queue_handler
+    # Detach the handler first so nothing is queued after the listener stops draining
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestTrace:
+    """Timings and debug details collected while one request is handled"""
+
+    def __init__(self, request_id: str, method: str, path: str):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self.status_code = None
+        self.duration_ms = None
+        self.stages = {}
+        self.details = {}
+        self.fallback_text = None
+
+    def to_dict(self) -> dict:
+        return {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "stages": self.stages,
+            "details": self.details,
+            "fallback_text": self.fallback_text,
+        }
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block of work and store it on the current request's trace"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace = current_trace.get()
+        if trace is not None:
+            elapsed = (time.perf_counter() - started) * 1000
+            trace.stages[name] = round(trace.stages.get(name, 0) + elapsed, 2)
+
+
+def record(key: str, value) -> None:
+    trace = current_trace.get()
+    if trace is not None:
+        trace.details[key] = value
+
+
+def record_fallback(text: str) -> None:
+    """Keep the raw Gemini text that could not be parsed as JSON"""
+    trace = current_trace.get()
+    if trace is not None:
+        trace.fallback_text = text[:MAX_RAW_TEXT_CHARS]
+
+
+class RequestRecorder:
+    """Ring buffers of recent requests and of requests that failed or needed the fallback parser
+
+    The slowest list is the top `size` of the last `window` requests, so an old
+    spike ages out instead of hiding later outliers.
+    """
+
+    def __init__(self, size: int = 50, window: int = 1000):
+        self.size = size
+        self._recent = deque(maxlen=window)
+        self._failed = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, trace: RequestTrace) -> None:
+        entry = trace.to_dict()
+        with self._lock:
+            if trace.status_code is None or trace.status_code >= 500 or trace.fallback_text is not None:
+                self._failed.append(entry)
+            self._recent.append(entry)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            recent = list(self._recent)
+            failed = list(reversed(self._failed))
+        slowest = heapq.nlargest(self.size, recent, key=lambda entry: entry["duration_ms"] or 0)
+        return {"slowest": slowest, "failed": failed}
@@ -0,0 +1,204 @@
+import csv
+from datetime import datetime, timedelta
+from xml.sax.saxutils import escape
+from services.utils import task_dates
+
+# Number of rows joined into one chunk before it is handed to the response
+CHUNK_ROWS = 256
+
+CSV_COLUMNS = [
+    "variant", "id", "title", "description", "team_member", "est_hours",
+    "risk_score", "start", "end", "dependencies", "critical",
+]
+
+
+class _LineBuffer:
+    """File-like object that hands back whatever csv.writer writes to it"""
+
+    def write(self, value):
+        return value
+
+
+def _chunked(lines, size=CHUNK_ROWS):
+    """Join small lines into bigger chunks so large plans are not sent row by row"""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def _selected_variants(plan: dict, variant: str = None):
+    variants = plan.get("variants", {})
+    if variant:
+        return [(variant, variants[variant])] if variant in variants else []
+    return list(variants.items())
+
+
+def iter_csv(plan: dict, variant: str = None):
+    """Yield the plan as CSV, one row per task across the selected variants"""
+    writer = csv.writer(_LineBuffer())
+
+    def rows():
+        yield writer.writerow(CSV_COLUMNS)
+        for name, variant_plan in _selected_variants(plan, variant):
+            critical = set(variant_plan.get("critical_path", []))
+            for task in variant_plan.get("tasks", []):
+                yield writer.writerow([
+                    name,
+                    task.get("id", ""),
+                    task.get("title", ""),
+                    task.get("description", ""),
+                    task.get("team_member", "1"),
+                    task.get("est_hours", ""),
+                    task.get("risk_score", ""),
+                    task.get("start", ""),
+                    task.get("end", ""),
+                    ";".join(task.get("dependencies", [])),
+                    "yes" if task.get("id") in critical else "no",
+                ])
+
+    return _chunked(rows())
+
+
+def _ics_escape(text) -> str:
+    text = str(text or "")
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _ics_line(line: str) -> str:
+    """Fold a content line to 75 octets as required by RFC 5545, without splitting a character"""
+    if len(line.encode("utf-8")) <= 75:
+        return line + "\r\n"
+    parts = []
+    current = []
+    size = 0
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        # The leading space of a continuation line counts towards its 75 octets
+        if size + char_size > 75:
+            parts.append("".join(current))
+            current = [" "]
+            size = 1
+        current.append(char)
+        size += char_size
+    parts.append("".join(current))
+    return "\r\n".join(parts) + "\r\n"
+
+
+def iter_ics(plan: dict, variant: str = "balanced"):
+    """Yield the plan as an iCalendar feed with one all-day event per member task"""
+    plan_id = plan.get("plan_id", "plan")
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+
+    def lines():
+        yield _ics_line("BEGIN:VCALENDAR")
+        yield _ics_line("VERSION:2.0")
+        yield _ics_line("PRODID:-//Smart Task Planner//Plan Export//EN")
+        yield _ics_line("CALSCALE:GREGORIAN")
+        yield _ics_line(f"X-WR-CALNAME:{_ics_escape(plan.get('summary') or plan_id)}")
+        for name, variant_plan in _selected_variants(plan, variant):
+            for task in variant_plan.get("tasks", []):
+                start, end = task_dates(task)
+                member = task.get("team_member", "1")
+                yield _ics_line("BEGIN:VEVENT")
+                yield _ics_line(f"UID:{plan_id}-{name}-{task.get('id', '')}@smart-task-planner")
+                yield _ics_line(f"DTSTAMP:{stamp}")
+                yield _ics_line(f"DTSTART;VALUE=DATE:{start.strftime('%Y%m%d')}")
+                yield _ics_line(f"DTEND;VALUE=DATE:{end.strftime('%Y%m%d')}")
+                yield _ics_line(f"SUMMARY:{_ics_escape(task.get('title', ''))}")
+                yield _ics_line(f"DESCRIPTION:{_ics_escape(task.get('description', ''))}")
+                yield _ics_line(f"CATEGORIES:{_ics_escape(name)},Team Member {_ics_escape(member)}")
+                yield _ics_line("END:VEVENT")
+        yield _ics_line("END:VCALENDAR")
+
+    return _chunked(lines())
+
+
+def _xml_duration(hours) -> str:
+    try:
+        minutes = int(round(float(hours) * 60))
+    except (TypeError, ValueError):
+        minutes = 0
+    return f"PT{minutes // 60}H{minutes % 60}M0S"
+
+
+def iter_project_xml(plan: dict, variant: str = "balanced"):
+    """Yield the plan as MS Project XML (MSPDI), which GanttProject can import too"""
+    selected = _selected_variants(plan, variant)
+    tasks = selected[0][1].get("tasks", []) if selected else []
+
+    def lines():
+        # Only the id -> UID map is kept around; task rows are still produced one at a time
+        uids = {}
+        members = set()
+        for uid, task in enumerate(tasks, start=1):
+            uids[task.get("id")] = uid
+            members.add(str(task.get("team_member", "1")))
+
+        yield '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        yield '<Project xmlns="http://schemas.microsoft.com/project">\n'
+        yield f"  <Name>{escape(plan.get('plan_id', 'plan'))}</Name>\n"
+        yield f"  <Title>{escape(plan.get('summary') or '')}</Title>\n"
+        yield "  <ScheduleFromStart>1</ScheduleFromStart>\n"
+        yield "  <Tasks>\n"
+        for uid, task in enumerate(tasks, start=1):
+            start, end = task_dates(task)
+            finish = end - timedelta(days=1)
+            yield "    <Task>\n"
+            yield f"      <UID>{uid}</UID>\n"
+            yield f"      <ID>{uid}</ID>\n"
+            yield f"      <Name>{escape(str(task.get('title', '')))}</Name>\n"
+            yield "      <OutlineLevel>1</OutlineLevel>\n"
+            yield f"      <Start>{start.isoformat()}T08:00:00</Start>\n"
+            yield f"      <Finish>{finish.isoformat()}T17:00:00</Finish>\n"
+            yield f"      <Duration>{_xml_duration(task.get('est_hours'))}</Duration>\n"
+            yield f"      <Notes>{escape(str(task.get('description', '')))}</Notes>\n"
+            for dep in task.get("dependencies", []):
+                if dep in uids:
+                    yield "      <PredecessorLink>\n"
+                    yield f"        <PredecessorUID>{uids[dep]}</PredecessorUID>\n"
+                    yield "        <Type>1</Type>\n"
+                    yield "      </PredecessorLink>\n"
+            yield "    </Task>\n"
+        yield "  </Tasks>\n"
+
+        resource_uids = {}
+        yield "  <Resources>\n"
+        for uid, member in enumerate(sorted(members, key=lambda m: (len(m), m)), start=1):
+            resource_uids[member] = uid
+            yield "    <Resource>\n"
+            yield f"      <UID>{uid}</UID>\n"
+            yield f"      <ID>{uid}</ID>\n"
+            yield f"      <Name>Team Member {escape(member)}</Name>\n"
+            yield "    </Resource>\n"
+        yield "  </Resources>\n"
+
+        yield "  <Assignments>\n"
+        for uid, task in enumerate(tasks, start=1):
+            yield "    <Assignment>\n"
+            yield f"      <UID>{uid}</UID>\n"
+            yield f"      <TaskUID>{uid}</TaskUID>\n"
+            yield f"      <ResourceUID>{resource_uids[str(task.get('team_member', '1'))]}</ResourceUID>\n"
+            yield "    </Assignment>\n"
+        yield "  </Assignments>\n"
+        yield "</Project>\n"
+
+    return _chunked(lines())
+
+
+# format -> (generator, media type, file extension)
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv", "csv"),
+    "ics": (iter_ics, "text/calendar", "ics"),
+    "xml": (iter_project_xml, "application/xml", "xml"),
+}
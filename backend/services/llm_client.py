@@ -1,10 +1,11 @@
 import os
 import json
+import logging
 import re
 import requests
-from dotenv import load_dotenv
+from services.diagnostics import record, record_fallback, stage
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 class LLMClient:
     def __init__(self):
@@ -14,28 +15,45 @@ class LLMClient:
         if not self.gemini_api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
 
+        # Reuse upstream connections across requests instead of a new TLS handshake each time
+        self.session = requests.Session()
+
+    def warm_up(self) -> None:
+        """Open a pooled connection to the Gemini host ahead of the first request"""
+        try:
+            self.session.head("https://generativelanguage.googleapis.com/", timeout=5)
+        except requests.RequestException as e:
+            logger.warning("Gemini warm-up failed: %s", e)
+
+    def close(self) -> None:
+        self.session.close()
+
     def generate_plan(self, payload: dict) -> dict:
         goal = payload.get('goal', '')
         team_size = payload.get('team_size', 1)
         mode = payload.get('mode', 'balanced')
         
-        print(f"Using Gemini API for goal: {goal}")
+        logger.info("Using Gemini API for goal: %s", goal)
         
         try:
             # Create the prompt for Gemini
             prompt = self._create_gemini_prompt(goal, team_size, mode)
+            record("prompt_chars", len(prompt))
             
             # Call Gemini API
-            response = self._call_gemini_api(prompt)
+            with stage("gemini_call"):
+                response = self._call_gemini_api(prompt)
+            record("response_chars", len(response))
             
             # Parse the response
-            parsed_response = self._parse_gemini_response(response, payload)
+            with stage("parse"):
+                parsed_response = self._parse_gemini_response(response, payload)
             
-            print(f"Successfully generated plan with Gemini API")
+            logger.info("Successfully generated plan with Gemini API")
             return parsed_response
             
         except Exception as e:
-            print(f"Gemini API error: {e}")
+            logger.error("Gemini API error: %s", e)
             raise Exception(f"Gemini API error: {e}")
 
     def _create_gemini_prompt(self, goal: str, team_size: int, mode: str) -> str:
@@ -158,8 +176,8 @@ Make sure the tasks are specific to the goal "{goal}" and not generic. Focus on
         
         url = f"{self.gemini_api_url}?key={self.gemini_api_key}"
         
-        print(f"Calling Gemini API...")
-        response = requests.post(url, headers=headers, json=data, timeout=30)
+        logger.debug("Calling Gemini API")
+        response = self.session.post(url, headers=headers, json=data, timeout=30)
         
         if response.status_code != 200:
             raise Exception(f"Gemini API error: {response.status_code} - {response.text}")
@@ -183,13 +201,14 @@ Make sure the tasks are specific to the goal "{goal}" and not generic. Focus on
         if json_match:
             try:
                 parsed_data = json.loads(json_match)
-                print(f"Successfully parsed Gemini JSON response")
+                logger.debug("Successfully parsed Gemini JSON response")
                 return parsed_data
             except json.JSONDecodeError as e:
-                print(f"JSON parsing error: {e}")
-                print(f"Response text: {response_text[:200]}...")
+                logger.warning("JSON parsing error: %s", e)
         
         # If JSON parsing fails, create a structured response from the text
+        logger.warning("Falling back to text parsing for Gemini response (%d chars)", len(response_text))
+        record_fallback(response_text)
         return self._create_structured_response_from_text(response_text, payload)
 
     def _extract_json_from_response(self, text: str) -> str:
@@ -0,0 +1,116 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class PlanStore:
+    """Keeps recently generated plans in memory so they can be exported later"""
+
+    def __init__(self, max_plans: int = 200):
+        self.max_plans = max_plans
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, plan_id: str, plan: dict) -> None:
+        with self._lock:
+            self._plans[plan_id] = plan
+            self._plans.move_to_end(plan_id)
+            # Drop the oldest plans once we go over the limit
+            while len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+
+    def get(self, plan_id: str):
+        with self._lock:
+            plan = self._plans.get(plan_id)
+            if plan is not None:
+                self._plans.move_to_end(plan_id)
+            return plan
+
+    def get_meta(self, plan_id: str):
+        with self._lock:
+            plan = self._plans.get(plan_id)
+        if plan is None:
+            return None
+        return {"etag": plan.get("etag"), "variants": list(plan.get("variants", {}))}
+
+    def warm_up(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class SQLitePlanStore:
+    """Plan store backed by a local SQLite file so every uvicorn worker sees the same plans"""
+
+    def __init__(self, path: str, max_plans: int = 200):
+        self.path = path
+        self.max_plans = max_plans
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        # WAL lets readers in other workers carry on while one worker writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS plans ("
+            "plan_id TEXT PRIMARY KEY, body TEXT NOT NULL, saved_at REAL NOT NULL, "
+            "etag TEXT, variants TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS plans_saved_at ON plans (saved_at)")
+        self._conn.commit()
+
+    def save(self, plan_id: str, plan: dict) -> None:
+        body = json.dumps(plan)
+        variants = json.dumps(list(plan.get("variants", {})))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plans (plan_id, body, saved_at, etag, variants) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (plan_id, body, time.time(), plan.get("etag"), variants),
+            )
+            # Drop the oldest plans once we go over the limit
+            self._conn.execute(
+                "DELETE FROM plans WHERE plan_id NOT IN "
+                "(SELECT plan_id FROM plans ORDER BY saved_at DESC LIMIT ?)",
+                (self.max_plans,),
+            )
+            self._conn.commit()
+
+    def get(self, plan_id: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body FROM plans WHERE plan_id = ?", (plan_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_meta(self, plan_id: str):
+        """Read just the ETag and variant names so revalidation does not decode the plan body"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, variants FROM plans WHERE plan_id = ?", (plan_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "variants": json.loads(row[1] or "[]")}
+
+    def warm_up(self) -> None:
+        """Touch the table and its index so the first lookup does not pay for page loads"""
+        with self._lock:
+            self._conn.execute("SELECT COUNT(*) FROM plans").fetchone()
+            self._conn.execute("SELECT MAX(saved_at) FROM plans").fetchone()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_plan_store():
+    """Use the shared SQLite store when PLAN_STORE_PATH is set, otherwise keep plans in memory"""
+    max_plans = int(os.getenv("PLAN_STORE_MAX_PLANS", "200"))
+    path = os.getenv("PLAN_STORE_PATH")
+    if path:
+        return SQLitePlanStore(path, max_plans=max_plans)
+    return PlanStore(max_plans=max_plans)
@@ -1,6 +1,9 @@
 from datetime import datetime, timedelta
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 class PlannerLogic:
     def __init__(self):
         self.work_hours_per_day = 8
@@ -170,7 +173,7 @@ class PlannerLogic:
         
         # If we found duplications, create specialized tasks
         if duplicated_tasks:
-            print(f"Found {len(duplicated_tasks)} duplicated tasks, creating specialized tasks...")
+            logger.info("Found %d duplicated tasks, creating specialized tasks", len(duplicated_tasks))
             
             # Create specialized task templates based on the goal
             specialized_tasks = self._create_specialized_tasks(tasks, team_size)
@@ -0,0 +1,84 @@
+import heapq
+from datetime import date, timedelta
+from services.utils import task_dates
+
+
+def _member_key(member: str):
+    return (len(member), member)
+
+
+def compute_layout(variant_plan: dict) -> dict:
+    """Work out date bounds, rows and bar offsets for one variant
+
+    Each team member gets their own band of rows, and inside a band a task goes
+    on the lowest row that is free by its start date. Tasks are annotated in
+    place with row, offset_days and duration_days.
+    """
+    tasks = variant_plan.get("tasks", [])
+    spans = [task_dates(task) for task in tasks]
+
+    if not spans:
+        return {"min_date": None, "max_date": None, "total_days": 0, "row_count": 0, "members": {}}
+
+    min_date = min(start for start, _ in spans)
+    max_date = max(end for _, end in spans)
+
+    # Pack each member's tasks into as few rows as possible, in start order
+    by_member = {}
+    for index, task in enumerate(tasks):
+        by_member.setdefault(str(task.get("team_member", "1")), []).append(index)
+
+    members = {}
+    next_row = 0
+    for member in sorted(by_member, key=_member_key):
+        busy = []  # (end, row) of rows still occupied
+        free = []  # rows that have become free again
+        row_count = 0
+        for index in sorted(by_member[member], key=lambda i: spans[i]):
+            start, end = spans[index]
+            while busy and busy[0][0] <= start:
+                heapq.heappush(free, heapq.heappop(busy)[1])
+            if free:
+                row = heapq.heappop(free)
+            else:
+                row = row_count
+                row_count += 1
+            heapq.heappush(busy, (end, row))
+
+            task = tasks[index]
+            task["row"] = next_row + row
+            task["offset_days"] = (start - min_date).days
+            task["duration_days"] = (end - start).days
+        members[member] = {"first_row": next_row, "row_count": row_count}
+        next_row += row_count
+
+    return {
+        "min_date": min_date.isoformat(),
+        "max_date": max_date.isoformat(),
+        "total_days": (max_date - min_date).days,
+        "row_count": next_row,
+        "members": members,
+    }
+
+
+def annotate_plan(plan: dict) -> dict:
+    """Precompute the timeline layout of every variant before the plan is stored"""
+    for variant_plan in plan.get("variants", {}).values():
+        variant_plan["layout"] = compute_layout(variant_plan)
+    return plan
+
+
+def select_tasks(variant_plan: dict, member: str = None, start: date = None, end: date = None):
+    """Yield the tasks of a variant that belong to a member and overlap the start..end window (inclusive)"""
+    # Task end dates are exclusive, so compare against the day after the window
+    window_end = end + timedelta(days=1) if end else None
+    for task in variant_plan.get("tasks", []):
+        if member is not None and str(task.get("team_member", "1")) != member:
+            continue
+        if start is not None or end is not None:
+            task_start, task_end = task_dates(task)
+            if window_end is not None and task_start >= window_end:
+                continue
+            if start is not None and task_end <= start:
+                continue
+        yield task
@@ -1,3 +1,24 @@
+import hashlib
+import json
 import uuid
+from datetime import date, timedelta
 def make_id(prefix="t"):
     return f"{prefix}{uuid.uuid4().hex[:8]}"
+
+def plan_etag(plan: dict) -> str:
+    body = json.dumps(plan, sort_keys=True, default=str).encode("utf-8")
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        return None
+
+def task_dates(task: dict):
+    """Start and exclusive end date of a task, falling back to today and a one-day span"""
+    start = parse_date(task.get("start")) or date.today()
+    end = parse_date(task.get("end")) or start + timedelta(days=1)
+    if end <= start:
+        end = start + timedelta(days=1)
+    return start, end
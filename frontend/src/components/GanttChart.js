@@ -10,10 +10,19 @@ export default function GanttChart({ tasks, criticalPath = [] }) {
     );
   }
 
-  // Calculate the date range
-  const dates = tasks.flatMap(task => [task.start, task.end]).filter(Boolean);
-  const minDate = new Date(Math.min(...dates.map(d => new Date(d))));
-  const maxDate = new Date(Math.max(...dates.map(d => new Date(d))));
+  // Calculate the date range (a plain loop, since spreading thousands of dates into Math.min overflows the stack)
+  let minTime = Infinity;
+  let maxTime = -Infinity;
+  for (const task of tasks) {
+    for (const value of [task.start, task.end]) {
+      if (!value) continue;
+      const time = new Date(value).getTime();
+      if (time < minTime) minTime = time;
+      if (time > maxTime) maxTime = time;
+    }
+  }
+  const minDate = new Date(minTime);
+  const maxDate = new Date(maxTime);
   
   // Add some padding
   minDate.setDate(minDate.getDate() - 1);